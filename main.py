@@ -1,27 +1,33 @@
 from src.DBManager import DBVacanciesManager
-from src.selenium_utils import save_cookies
 from src.ui_utils import *
 
+ACTIONS = {
+    "1": handle_search_and_save,
+    "2": handle_show_all,
+    "3": handle_search_by_keyword,
+    "4": clear_table,
+    "5": handle_export,
+    "6": handle_login,
+    "7": send_apply_to_vacancy,
+    "10": exit_program
+}
+
+
+def invalid_choice(_=None):
+    print("Неверный выбор. Попробуйте снова.")
+
 
 def main():
     writer = DBVacanciesManager()
 
-    actions = {
-        "1": handle_search_and_save,
-        "2": handle_show_all,
-        "3": handle_search_by_keyword,
-        "4": clear_table,
-        "5": handle_export,
-        "6": save_cookies,
-        "7": send_apply_to_vacancy,
-        "10": exit_program
-    }
-
-    while True:
-        print_menu()
-        choice = input("\nВведите номер действия: ")
-        action = actions.get(choice, lambda writer: print("Неверный выбор. Попробуйте снова."))
-        action(writer)
+    try:
+        while True:
+            print_menu()
+            choice = input("\nВведите номер действия: ")
+            action = ACTIONS.get(choice, invalid_choice)
+            action(writer)
+    finally:
+        writer.close()
 
 
 if __name__ == "__main__":
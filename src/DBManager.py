@@ -5,27 +5,74 @@
 - Создание и очистка таблиц вакансий.
 - Запись, получение и поиск вакансий.
 - Учёт уже обработанных вакансий (processed_urls).
+- Кэш детальной информации о вакансиях (vacancy_details).
 """
 
 import sqlite3
+import time
 from pathlib import Path
 
+# Часто выполняемые запросы. sqlite3 кэширует подготовленные выражения
+# по тексту SQL, поэтому один и тот же текст не разбирается повторно.
+INSERT_VACANCY_SQL = "INSERT OR IGNORE INTO vacancies (id, name, description) VALUES (?, ?, ?);"
+INSERT_PROCESSED_SQL = "INSERT OR IGNORE INTO processed_urls (id) VALUES (?);"
+
+# Токенизатор trigram появился в SQLite 3.34: без него поиск идёт по таблице через LIKE
+FTS_TRIGRAM_SUPPORTED = sqlite3.sqlite_version_info >= (3, 34, 0)
+
 
 class DBVacanciesManager:
     """
     Менеджер для работы с базой данных SQLite (вакансии и обработанные ID).
     """
 
+    # Максимальное количество строк в одной транзакции пакетной записи
+    BULK_CHUNK_SIZE = 500
+
     def __init__(self, db_path="vacancies.db"):
         """
         Args:
             db_path (str): Путь к файлу базы данных.
         """
         self.db_path = Path(db_path)
+        self._conn = None
+        # Кэш ID из processed_urls, заполняется при первой проверке
+        self._processed_cache = None
+        # Кэш результата get_all_vacancies, сбрасывается при изменении таблицы vacancies
+        self._vacancies_cache = None
+        # Индекс vacancies_fts проверен (и при необходимости создан) этим менеджером
+        self._fts_ready = False
 
     def connect(self):
-        """Создаёт подключение к базе данных SQLite."""
-        return sqlite3.connect(self.db_path.as_posix())
+        """
+        Возвращает подключение к базе данных SQLite.
+
+        Подключение создаётся при первом обращении и переиспользуется
+        всеми последующими запросами, пока не будет вызван close().
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.db_path.as_posix(),
+                isolation_level=None,
+                cached_statements=256
+            )
+            # WAL снимает блокировку чтения на время записи, а synchronous=NORMAL
+            # убирает fsync на каждый коммит (достаточно fsync при checkpoint)
+            for pragma in (
+                "PRAGMA journal_mode=WAL;",
+                "PRAGMA synchronous=NORMAL;",
+                "PRAGMA temp_store=MEMORY;",
+                "PRAGMA mmap_size=268435456;",
+                "PRAGMA cache_size=-65536;",
+            ):
+                self._conn.execute(pragma)
+        return self._conn
+
+    def close(self):
+        """Закрывает подключение к базе данных, если оно было открыто."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
     @staticmethod
     def map_to_dict(keys, rows):
@@ -33,7 +80,10 @@ class DBVacanciesManager:
         return [dict(zip(keys, row)) for row in rows]
 
     def create_table(self):
-        """Создаёт таблицу vacancies, если она не существует."""
+        """
+        Создаёт таблицу vacancies и полнотекстовый индекс vacancies_fts,
+        если они не существуют.
+        """
         self.execute_query("""
             CREATE TABLE IF NOT EXISTS vacancies (
                 id INTEGER PRIMARY KEY,
@@ -41,11 +91,69 @@ class DBVacanciesManager:
                 description TEXT
             );
         """)
+        self.create_fts_table()
         print("Таблица vacancies успешно создана.")
 
+    def create_fts_table(self):
+        """
+        Создаёт FTS5-индекс vacancies_fts над таблицей vacancies
+        и триггеры для его синхронизации.
+
+        Индекс использует токенизатор trigram: он сохраняет поиск по любой
+        подстроке (как LIKE '%kw%'), в том числе для "C++", "C#" и ".NET".
+        Индекс прежней версии с токенизатором unicode61 удаляется вместе
+        с триггерами и строится заново. Если индекс создаётся для уже
+        заполненной таблицы, он перестраивается.
+        Проверка выполняется один раз на менеджер и только там, где индекс
+        нужен (create_table и get_vacancies_by_keyword), поэтому базы,
+        созданные до появления vacancies_fts, получают его при первом поиске.
+        """
+        if self._fts_ready:
+            return
+        tables = dict(self.execute_query(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name IN ('vacancies', 'vacancies_fts');",
+            fetch_all=True
+        ))
+        if "vacancies" not in tables:
+            return
+        if "vacancies_fts" in tables and "trigram" not in tables["vacancies_fts"]:
+            for statement in (
+                "DROP TRIGGER IF EXISTS vacancies_fts_ai;",
+                "DROP TRIGGER IF EXISTS vacancies_fts_ad;",
+                "DROP TABLE vacancies_fts;",
+            ):
+                self.execute_query(statement)
+            del tables["vacancies_fts"]
+        if not FTS_TRIGRAM_SUPPORTED:
+            self._fts_ready = True
+            return
+        self.execute_query("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5(
+                name, description,
+                content='vacancies', content_rowid='id',
+                tokenize='trigram'
+            );
+        """)
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS vacancies_fts_ai AFTER INSERT ON vacancies BEGIN
+                INSERT INTO vacancies_fts (rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END;
+        """)
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS vacancies_fts_ad AFTER DELETE ON vacancies BEGIN
+                INSERT INTO vacancies_fts (vacancies_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END;
+        """)
+        if "vacancies_fts" not in tables:
+            self.execute_query("INSERT INTO vacancies_fts (vacancies_fts) VALUES ('rebuild');")
+        self._fts_ready = True
+
     def clear_table(self):
         """Очищает таблицу vacancies."""
         self.execute_query("DELETE FROM vacancies;")
+        self._vacancies_cache = None
         print("Таблица vacancies очищена.")
 
     def write_data(self, data):
@@ -55,46 +163,70 @@ class DBVacanciesManager:
         Args:
             data (list[dict]): Список вакансий с ключами id, name, description.
         """
-        query = """
-            INSERT OR IGNORE INTO vacancies 
-            (id, name, description)
-            VALUES (?, ?, ?);
-        """
-        data_tuples = list(map(lambda v: (
-            v["id"], v["name"], v["description"]
-        ), data))
+        data_tuples = ((v["id"], v["name"], v["description"]) for v in data)
 
-        self.execute_query(query, data_tuples, executemany=True)
+        self.execute_query(INSERT_VACANCY_SQL, data_tuples, executemany=True)
+        self._vacancies_cache = None
         print("Данные успешно записаны в базу данных.")
 
     def get_all_vacancies(self):
-        """Возвращает все вакансии в виде списка словарей."""
-        rows = self.execute_query(
-            "SELECT id, name, description FROM vacancies;",
-            fetch_all=True
-        )
-        keys = ["id", "vacancy_name", "description"]
-        return self.map_to_dict(keys, rows)
+        """
+        Возвращает все вакансии в виде списка словарей.
+
+        Результат запоминается до следующего clear_table() или write_data(),
+        поэтому повторный просмотр, экспорт и отклики не читают таблицу заново.
+        """
+        if self._vacancies_cache is None:
+            rows = self.execute_query(
+                "SELECT id, name, description FROM vacancies;",
+                fetch_all=True
+            )
+            keys = ["id", "vacancy_name", "description"]
+            self._vacancies_cache = self.map_to_dict(keys, rows)
+        return list(self._vacancies_cache)
 
     def get_vacancies_by_keyword(self, keyword):
         """
         Ищет вакансии по ключевому слову в названии.
 
+        Совпадением считается название, содержащее ключевое слово как
+        подстроку. Слова от трёх символов ищутся по trigram-индексу
+        vacancies_fts без учёта регистра (в том числе для кириллицы).
+        Более короткие слова индекс не различает, поэтому они проверяются
+        через LIKE по строкам индекса (регистр не учитывается только для латиницы).
+
         Args:
             keyword (str): Ключевое слово для поиска.
 
         Returns:
             list[dict]: Найденные вакансии.
         """
-        rows = self.execute_query(
+        keyword = keyword or ""
+        self.create_fts_table()
+        if not FTS_TRIGRAM_SUPPORTED:
+            query = "SELECT id, name FROM vacancies WHERE LOWER(name) LIKE LOWER(?);"
+            param = f"%{keyword}%"
+        elif len(keyword) >= 3:
+            # Экранируем кавычки и ищем слово как фразу, чтобы спецсимволы
+            # синтаксиса FTS5 в запросе пользователя не ломали выражение MATCH
+            query = """
+                SELECT id, name
+                FROM vacancies
+                WHERE id IN (
+                    SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH ?
+                );
             """
-            SELECT id, name
-            FROM vacancies
-            WHERE LOWER(name) LIKE LOWER(?);
-            """,
-            (f"%{keyword}%",),
-            fetch_all=True
-        )
+            param = 'name : "{}"'.format(keyword.replace('"', '""'))
+        else:
+            query = """
+                SELECT id, name
+                FROM vacancies
+                WHERE id IN (
+                    SELECT rowid FROM vacancies_fts WHERE name LIKE ?
+                );
+            """
+            param = f"%{keyword}%"
+        rows = self.execute_query(query, (param,), fetch_all=True)
         keys = ["id", "vacancy_name"]
         return self.map_to_dict(keys, rows)
 
@@ -110,20 +242,32 @@ class DBVacanciesManager:
 
         Returns:
             list | None: Результаты запроса или None.
+
+        Пакетная запись (executemany) выполняется в одной явной транзакции.
         """
         try:
-            with self.connect() as conn:
-                cursor = conn.cursor()
-                if data:
-                    (cursor.executemany if executemany else cursor.execute)(query, data)
-                else:
-                    cursor.execute(query)
+            conn = self.connect()
+            cursor = conn.cursor()
+            if data and executemany:
+                cursor.execute("BEGIN IMMEDIATE;")
+                try:
+                    cursor.executemany(query, data)
+                    cursor.execute("COMMIT;")
+                except BaseException:
+                    # Строки могут приходить из генератора: любая ошибка при их
+                    # формировании не должна оставлять транзакцию и блокировку записи
+                    conn.rollback()
+                    raise
+            elif data:
+                cursor.execute(query, data)
+            else:
+                cursor.execute(query)
 
-                if fetch_all:
-                    return cursor.fetchall()
-
-                conn.commit()
+            if fetch_all:
+                return cursor.fetchall()
         except sqlite3.Error as e:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.rollback()
             print(f"SQLite ошибка: {e}")
             return [] if fetch_all else None
 
@@ -139,36 +283,106 @@ class DBVacanciesManager:
     def insert_processed_id(self, vacancy_id):
         """Добавляет один обработанный ID в таблицу processed_urls."""
         self.execute_query(
-            "INSERT OR IGNORE INTO processed_urls (id) VALUES (?);",
+            INSERT_PROCESSED_SQL,
             (vacancy_id,)
         )
+        if self._processed_cache is not None:
+            self._processed_cache.add(int(vacancy_id))
 
     def insert_processed_ids_bulk(self, ids):
-        """Добавляет несколько обработанных ID в таблицу processed_urls."""
-        self.execute_query(
-            "INSERT OR IGNORE INTO processed_urls (id) VALUES (?);",
-            [(vid,) for vid in ids],
-            executemany=True
-        )
+        """
+        Добавляет несколько обработанных ID в таблицу processed_urls.
+
+        Запись идёт порциями по BULK_CHUNK_SIZE строк, чтобы не держать
+        блокировку записи долго при параллельной работе нескольких потоков.
+        """
+        rows = [(vid,) for vid in ids]
+        for start in range(0, len(rows), self.BULK_CHUNK_SIZE):
+            self.execute_query(
+                INSERT_PROCESSED_SQL,
+                rows[start:start + self.BULK_CHUNK_SIZE],
+                executemany=True
+            )
+        if self._processed_cache is not None:
+            self._processed_cache.update(int(vid) for (vid,) in rows)
 
     def is_id_processed(self, vacancy_id):
         """
         Проверяет, есть ли вакансия с данным ID в processed_urls.
 
+        При первом вызове загружает все обработанные ID в память,
+        последующие проверки выполняются по кэшу без запросов к базе.
+
         Args:
             vacancy_id (int): ID вакансии.
 
         Returns:
             bool: True, если ID уже обработан.
         """
-        result = self.execute_query(
-            "SELECT 1 FROM processed_urls WHERE id = ?;",
-            (vacancy_id,),
-            fetch_all=True
-        )
-        return bool(result)
+        if self._processed_cache is None:
+            self._processed_cache = self.get_all_processed_ids()
+        return int(vacancy_id) in self._processed_cache
 
     def get_all_processed_ids(self):
         """Возвращает множество всех обработанных ID."""
         rows = self.execute_query("SELECT id FROM processed_urls;", fetch_all=True)
         return set(row[0] for row in rows)
+
+    def create_details_cache_table(self, max_age):
+        """
+        Создаёт таблицу vacancy_details для кэша детальной информации
+        и удаляет из неё устаревшие записи.
+
+        Args:
+            max_age (float): Срок хранения записи в секундах.
+        """
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS vacancy_details (
+                id INTEGER PRIMARY KEY,
+                detail BLOB,
+                fetched_at REAL
+            );
+        """)
+        self.execute_query(
+            "DELETE FROM vacancy_details WHERE fetched_at < ?;",
+            (time.time() - max_age,)
+        )
+
+    def get_cached_details(self, ids, max_age):
+        """
+        Возвращает сохранённую детальную информацию для указанных вакансий.
+
+        Args:
+            ids (list): ID вакансий.
+            max_age (float): Максимальный возраст записи в секундах.
+
+        Returns:
+            dict[int, bytes]: Сериализованная информация по ID (только найденные).
+        """
+        ids = [int(vid) for vid in ids]
+        min_fetched_at = time.time() - max_age
+        cached = {}
+        for start in range(0, len(ids), self.BULK_CHUNK_SIZE):
+            chunk = ids[start:start + self.BULK_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self.execute_query(
+                f"SELECT id, detail FROM vacancy_details WHERE id IN ({placeholders}) AND fetched_at >= ?;",
+                (*chunk, min_fetched_at),
+                fetch_all=True
+            )
+            cached.update(rows)
+        return cached
+
+    def cache_details(self, details):
+        """
+        Сохраняет детальную информацию о вакансиях в кэш.
+
+        Args:
+            details (Iterable[tuple[int, bytes]]): Пары (ID вакансии, сериализованная информация).
+        """
+        fetched_at = time.time()
+        self.execute_query(
+            "INSERT OR REPLACE INTO vacancy_details (id, detail, fetched_at) VALUES (?, ?, ?);",
+            ((int(vid), detail, fetched_at) for vid, detail in details),
+            executemany=True
+        )
@@ -10,21 +10,27 @@
 
 Основные компоненты:
 - Settings: Конфигурация параметров запросов
+- create_session: HTTP-сессия с настроенным пулом соединений
 - HHClient: Клиент для работы с API HH.ru
 - Утилиты для обработки данных
 - Основная функция get_vacancies_async
 """
 
 import asyncio
+import contextlib
+import math
 import os
 import re
 import logging
-from typing import List, Optional, Tuple, Dict
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Dict
 from dataclasses import dataclass
+from functools import lru_cache
+from urllib.parse import quote, urlencode
 
 import aiohttp
+import orjson
 from dotenv import load_dotenv
-from tqdm.asyncio import tqdm_asyncio
+from tqdm import tqdm
 
 from src.DBManager import DBVacanciesManager
 
@@ -40,11 +46,19 @@ class Settings:
     Атрибуты:
         max_concurrent (int): Максимальное количество одновременных запросов
         request_timeout (float): Задержка между запросами в секундах
+            (REQUEST_TIMEOUT задаётся в сотых долях секунды, допускаются дробные значения)
         per_page (int): Количество вакансий на страницу
+        details_cache_ttl (float): Срок хранения кэша детальной информации в секундах
+        max_retries (int): Сколько раз повторять запрос, получивший HTTP 429
+        retry_backoff (float): Задержка перед первым повтором в секундах,
+            каждый следующий повтор ждёт вдвое дольше
     """
-    max_concurrent: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", 1))
-    request_timeout: float = int(os.getenv("REQUEST_TIMEOUT", 0)) / 100
-    per_page: int = int(os.getenv("PER_PAGE", 100))
+    max_concurrent: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "1"))
+    request_timeout: float = float(os.getenv("REQUEST_TIMEOUT", "0")) / 100.0
+    per_page: int = int(os.getenv("PER_PAGE", "100"))
+    details_cache_ttl: float = float(os.getenv("DETAILS_CACHE_TTL", "86400"))
+    max_retries: int = int(os.getenv("MAX_RETRIES", "3"))
+    retry_backoff: float = float(os.getenv("RETRY_BACKOFF", "1"))
 
 
 settings = Settings()
@@ -53,9 +67,6 @@ settings = Settings()
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
-# Семафор для ограничения количества одновременных запросов
-semaphore = asyncio.Semaphore(settings.max_concurrent)
-
 
 class CaptchaRequired(Exception):
     """
@@ -67,6 +78,25 @@ class CaptchaRequired(Exception):
 
 
 # === Утилиты ===
+# Регулярные выражения для clean_html компилируются один раз при импорте.
+# Каждый проход заменяет совпадения строкой-константой целиком на стороне C:
+# один проход с Python-функцией замены оказывается в ~3 раза медленнее,
+# так как вызывает её для каждого тега.
+_BR_RE = re.compile(r'<br\s*/?>')
+_TAG_RE = re.compile(r'<[^>]+>')
+_ENT_RE = re.compile(r'&[^;]+;')
+_NL_RE = re.compile(r'\n+')
+
+# Описание вакансии, для которой детальная информация не загружалась
+NO_DESCRIPTION = "Описание отсутствует"
+
+# Вакансии, в названии которых встречается любое из этих слов, отбрасываются
+EXCLUDE_WORDS = frozenset({
+    "преподава", "репетитор", "педагог", "учите", "аналитик", "c#", "c++", "frontend",
+})
+_EXCLUDE_RE = re.compile('|'.join(map(re.escape, sorted(EXCLUDE_WORDS))))
+
+
 def clean_html(raw_html: str) -> str:
     """
     Очищает HTML-контент от тегов и спецсимволов.
@@ -81,14 +111,10 @@ def clean_html(raw_html: str) -> str:
         >>> clean_html("<p>Python<br>developer</p>")
         'Python\ndeveloper'
     """
-    # Заменяем <br> теги на переносы строк
-    text = re.sub(r'<br\s*/?>', '\n', raw_html)
-    # Удаляем все HTML-теги
-    text = re.sub(r'<[^>]+>', '', text)
-    # Заменяем HTML-сущности на пробелы
-    text = re.sub(r'&[^;]+;', ' ', text)
+    # <br> заменяем на перенос строки, теги удаляем, сущности заменяем на пробел
+    text = _ENT_RE.sub(' ', _TAG_RE.sub('', _BR_RE.sub('\n', raw_html)))
     # Убираем лишние переносы строк
-    return re.sub(r'\n+', '\n', text).strip()
+    return _NL_RE.sub('\n', text).strip()
 
 
 def parse_vacancy(vacancy: Dict, detail: Optional[Dict] = None) -> Dict:
@@ -109,17 +135,19 @@ def parse_vacancy(vacancy: Dict, detail: Optional[Dict] = None) -> Dict:
     return {
         "id": vacancy["id"],
         "name": vacancy["name"],
-        "description": clean_html(description or "Описание отсутствует"),
+        # Заглушку не прогоняем через clean_html: в ней нет разметки
+        "description": clean_html(description) if description else NO_DESCRIPTION,
     }
 
 
-def has_required_skills(detail: Dict, required_skills: List[str]) -> bool:
+def has_required_skills(detail: Dict, required_skills: Iterable[str]) -> bool:
     """
     Проверяет наличие требуемых навыков в вакансии.
     
     Args:
         detail (Dict): Детальная информация о вакансии
-        required_skills (List[str]): Список требуемых навыков
+        required_skills (Iterable[str]): Требуемые навыки в нижнем регистре
+            (в основном цикле передаётся frozenset)
         
     Returns:
         bool: True если все требуемые навыки присутствуют
@@ -132,35 +160,98 @@ def has_required_skills(detail: Dict, required_skills: List[str]) -> bool:
     # Получаем навыки из вакансии (приводим к нижнему регистру)
     skills = {skill['name'].lower() for skill in detail.get("key_skills", [])}
     # Проверяем наличие всех требуемых навыков
-    return all(skill.lower() in skills for skill in required_skills)
+    return skills.issuperset(required_skills)
+
+
+def mentions_any_skill(vacancy: Dict, required_skills: Iterable[str]) -> bool:
+    """
+    Проверяет, упоминается ли хотя бы один требуемый навык в кратких данных вакансии.
+    
+    Используется как предварительный фильтр по ответу поиска, чтобы не
+    запрашивать детальную информацию для заведомо неподходящих вакансий.
+    Фильтр неточный: навык может быть указан только в key_skills.
+    
+    Args:
+        vacancy (Dict): Вакансия из списка результатов поиска
+        required_skills (Iterable[str]): Требуемые навыки в нижнем регистре
+        
+    Returns:
+        bool: True если навык встречается в названии, требованиях или обязанностях
+    """
+    snippet = vacancy.get("snippet") or {}
+    text = " ".join((
+        vacancy["name"],
+        snippet.get("requirement") or "",
+        snippet.get("responsibility") or "",
+    )).lower()
+    return any(skill in text for skill in required_skills)
 
 
-def build_params(keyword: str, search_field: str, page: int, per_page: int, order_by: Optional[str] = None) -> Dict:
+@lru_cache(maxsize=32)
+def build_query(keyword: str, search_field: str, per_page: int, order_by: Optional[str] = None) -> str:
     """
-    Строит параметры запроса к API HH.ru.
+    Строит закодированную строку запроса к API HH.ru без номера страницы.
+    
+    Параметры поиска не меняются между страницами, поэтому строка
+    кэшируется и для каждой страницы к ней только дописывается page.
     
     Args:
         keyword (str): Поисковый запрос
         search_field (str): Поле поиска (name, description, company_name)
-        page (int): Номер страницы
         per_page (int): Количество вакансий на страницу
         order_by (Optional[str]): Сортировка (publication_time, salary_desc, etc.)
         
     Returns:
-        Dict: Параметры для HTTP-запроса
+        str: Строка запроса вида "text=...&search_field=...&per_page=..."
     """
     params = {
         "text": keyword,
         "search_field": search_field,
         "per_page": per_page,
-        "page": page,
     }
     if order_by:
         params["order_by"] = order_by
-    return params
+    return urlencode(params, quote_via=quote)
 
 
 # === API-клиент ===
+async def read_json(resp: aiohttp.ClientResponse):
+    """
+    Читает тело ответа и разбирает его как JSON с помощью orjson.
+    
+    Args:
+        resp (aiohttp.ClientResponse): Ответ API
+        
+    Returns:
+        Разобранный JSON (обычно Dict)
+    """
+    return orjson.loads(await resp.read())
+
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Создаёт HTTP-сессию для работы с API HH.ru.
+    
+    Лимит соединений коннектора ограничивает число одновременных запросов,
+    соединения с api.hh.ru держатся открытыми между запросами, DNS кэшируется.
+    Сессию нужно создавать внутри работающего event loop и закрывать
+    в нём же, поэтому переиспользовать её можно только в пределах одного loop.
+    
+    Returns:
+        aiohttp.ClientSession: Настроенная HTTP-сессия
+    """
+    connector = aiohttp.TCPConnector(
+        limit=settings.max_concurrent,
+        limit_per_host=settings.max_concurrent,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+        enable_cleanup_closed=True,
+    )
+    # Таймауты только на сокет: ожидание свободного соединения в пуле не ограничено
+    timeout = aiohttp.ClientTimeout(sock_connect=5, sock_read=30)
+    return aiohttp.ClientSession(headers={"User-Agent": "my-hh-bot"}, connector=connector, timeout=timeout)
+
+
 class HHClient:
     """
     Клиент для работы с API HeadHunter.
@@ -172,6 +263,8 @@ class HHClient:
     """
 
     BASE_URL = "https://api.hh.ru/vacancies"
+    # Поля детальной информации, которые используются при разборе вакансий
+    DETAIL_FIELDS = ("description", "key_skills")
 
     def __init__(self, session: aiohttp.ClientSession):
         """
@@ -182,6 +275,37 @@ class HHClient:
         """
         self.session = session
 
+    @contextlib.asynccontextmanager
+    async def _get(self, url: str) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Выполняет GET-запрос, повторяя его с экспоненциальной задержкой при HTTP 429.
+        
+        Одновременность запросов ограничена коннектором сессии, а при
+        превышении лимита HH.ru отвечает 429: такой ответ освобождается,
+        и запрос повторяется не более settings.max_retries раз.
+        
+        Args:
+            url (str): Адрес запроса
+            
+        Yields:
+            aiohttp.ClientResponse: Ответ последней попытки
+        """
+        delay = settings.retry_backoff
+        for _ in range(settings.max_retries):
+            resp = await self.session.get(url)
+            if resp.status != 429:
+                break
+            resp.release()
+            logger.warning(f"HH.ru ограничил частоту запросов, повтор через {delay:g} с")
+            await asyncio.sleep(delay)
+            delay *= 2
+        else:
+            resp = await self.session.get(url)
+        try:
+            yield resp
+        finally:
+            resp.release()
+
     async def fetch_details(self, vacancy_id: str) -> Optional[Dict]:
         """
         Загружает детальную информацию о вакансии.
@@ -190,18 +314,19 @@ class HHClient:
             vacancy_id (str): ID вакансии
             
         Returns:
-            Optional[Dict]: Детальная информация или None при ошибке
+            Optional[Dict]: Детальная информация (только поля DETAIL_FIELDS) или None при ошибке
             
         Raises:
             CaptchaRequired: Если требуется капча
         """
-        async with semaphore:  # Ограничиваем количество одновременных запросов
-            await asyncio.sleep(settings.request_timeout)  # Задержка между запросами
-            async with self.session.get(f"{self.BASE_URL}/{vacancy_id}") as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                if resp.status == 403 and "captcha_required" in await resp.text():
-                    raise CaptchaRequired
+        await asyncio.sleep(settings.request_timeout)  # Задержка между запросами
+        async with self._get(f"{self.BASE_URL}/{vacancy_id}") as resp:
+            if resp.status == 200:
+                detail = await read_json(resp)
+                # Не храним весь ответ до конца пачки, оставляем только нужные поля
+                return {field: detail[field] for field in self.DETAIL_FIELDS if field in detail}
+            if resp.status == 403 and "captcha_required" in await resp.text():
+                raise CaptchaRequired
 
     async def get_total_count(self, keyword: str, search_field: str, order_by: Optional[str] = None) -> int:
         """
@@ -215,12 +340,12 @@ class HHClient:
         Returns:
             int: Общее количество найденных вакансий
         """
-        params = build_params(keyword, search_field, 0, 1, order_by)
-        async with self.session.get(self.BASE_URL, params=params) as resp:
+        url = f"{self.BASE_URL}?{build_query(keyword, search_field, 1, order_by)}&page=0"
+        async with self._get(url) as resp:
             if resp.status != 200:
                 logger.error(f"Ошибка запроса общего количества вакансий: {resp.status}")
                 return 0
-            data = await resp.json()
+            data = await read_json(resp)
             return data.get("found", 0)
 
     async def fetch_page(self, keyword: str, search_field: str, page: int, order_by: Optional[str] = None) -> List[
@@ -237,30 +362,151 @@ class HHClient:
         Returns:
             List[Dict]: Список вакансий на странице
         """
-        params = build_params(keyword, search_field, page, settings.per_page, order_by)
-        async with self.session.get(self.BASE_URL, params=params) as resp:
+        url = f"{self.BASE_URL}?{build_query(keyword, search_field, settings.per_page, order_by)}&page={page}"
+        async with self._get(url) as resp:
             if resp.status != 200:
                 logger.error(f"Ошибка загрузки страницы {page}: {resp.status}")
                 return []
-            data = await resp.json()
+            data = await read_json(resp)
             return data.get("items", [])
 
-    async def fetch_details_batch(self, vacancies: List[Dict], show_progress: bool = True) -> List[Optional[Dict]]:
+    async def fetch_pages(self, keyword: str, search_field: str, pages: range,
+                          order_by: Optional[str] = None) -> List[Dict]:
+        """
+        Параллельно загружает несколько страниц вакансий.
+        
+        Args:
+            keyword (str): Поисковый запрос
+            search_field (str): Поле поиска
+            pages (range): Номера страниц
+            order_by (Optional[str]): Сортировка
+            
+        Returns:
+            List[Dict]: Вакансии со всех страниц в порядке номеров страниц
+        """
+        results = await asyncio.gather(
+            *(self.fetch_page(keyword, search_field, page, order_by) for page in pages)
+        )
+        return [vacancy for items in results for vacancy in items]
+
+    async def iter_details(self, vacancies: List[Dict],
+                           show_progress: bool = True) -> AsyncIterator[Tuple[int, Optional[Dict]]]:
         """
-        Загружает детальную информацию для списка вакансий.
+        Загружает детальную информацию и отдаёт её по мере получения.
         
         Args:
             vacancies (List[Dict]): Список вакансий
             show_progress (bool): Показывать прогресс-бар
             
-        Returns:
-            List[Optional[Dict]]: Список детальной информации
+        Yields:
+            Tuple[int, Optional[Dict]]: (индекс вакансии в списке, детальная информация)
+            в порядке завершения запросов
+            
+        Raises:
+            CaptchaRequired: Если требуется капча
+            
+        Вакансии передаются через ограниченную очередь фиксированному числу
+        обработчиков, поэтому количество одновременно существующих корутин
+        не зависит от размера списка. Если перестать читать генератор
+        (и закрыть его), оставшиеся запросы отменяются.
         """
-        ids = [v["id"] for v in vacancies]
-        # Выбираем метод сбора результатов в зависимости от настроек прогресса
-        fetcher = tqdm_asyncio.gather if show_progress else asyncio.gather
-        return await fetcher(*(self.fetch_details(vid) for vid in ids),
-                             desc="Загрузка деталей", ncols=80)
+        # Все детали уже взяты из кэша (или отфильтрованы): не запускаем
+        # обработчики и не показываем пустой прогресс-бар
+        if not vacancies:
+            return
+
+        jobs: asyncio.Queue = asyncio.Queue(maxsize=settings.max_concurrent * 2)
+        done: asyncio.Queue = asyncio.Queue()
+        progress = tqdm(total=len(vacancies), desc="Загрузка деталей", ncols=80, disable=not show_progress)
+
+        async def produce():
+            """Кладёт (индекс, ID) в очередь заданий."""
+            for idx, vacancy in enumerate(vacancies):
+                await jobs.put((idx, vacancy["id"]))
+
+        async def worker():
+            """Выполняет задания и передаёт результат (или ошибку) в очередь готовых."""
+            while True:
+                idx, vacancy_id = await jobs.get()
+                try:
+                    detail = await self.fetch_details(vacancy_id)
+                except Exception as error:
+                    await done.put((idx, None, error))
+                    return
+                progress.update()
+                await done.put((idx, detail, None))
+
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(worker()) for _ in range(settings.max_concurrent)]
+        try:
+            for _ in range(len(vacancies)):
+                idx, detail, error = await done.get()
+                if error is not None:
+                    raise error
+                yield idx, detail
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            progress.close()
+
+
+async def iter_details_cached(client: HHClient, db: DBVacanciesManager, vacancies: List[Dict],
+                              show_progress: bool = True) -> AsyncIterator[Tuple[Dict, Optional[Dict]]]:
+    """
+    Отдаёт детальную информацию о вакансиях, используя кэш в таблице vacancy_details.
+    
+    Сначала отдаются вакансии из кэша, затем по мере получения из сети —
+    вакансии, которых нет в кэше или запись для которых старше
+    settings.details_cache_ttl. Полученные ответы сохраняются в кэш при
+    закрытии генератора, в том числе при досрочной остановке.
+    
+    Args:
+        client (HHClient): Клиент API HH.ru
+        db (DBVacanciesManager): Менеджер базы данных с таблицей vacancy_details
+        vacancies (List[Dict]): Список вакансий
+        show_progress (bool): Показывать прогресс-бар
+        
+    Yields:
+        Tuple[Dict, Optional[Dict]]: (вакансия, детальная информация)
+        
+    Raises:
+        CaptchaRequired: Если требуется капча
+    """
+    cached = db.get_cached_details([v["id"] for v in vacancies], settings.details_cache_ttl)
+    missing = []
+    for vacancy in vacancies:
+        detail = cached.get(int(vacancy["id"]))
+        if detail is None:
+            missing.append(vacancy)
+        else:
+            yield vacancy, orjson.loads(detail)
+
+    fetched = []
+    details = client.iter_details(missing, show_progress)
+    try:
+        async for idx, detail in details:
+            if detail:
+                fetched.append((missing[idx]["id"], orjson.dumps(detail)))
+            yield missing[idx], detail
+    finally:
+        await details.aclose()
+        db.cache_details(fetched)
+
+
+async def _cancel_task(task: asyncio.Task) -> None:
+    """
+    Отменяет задачу и дожидается её завершения.
+    
+    Ошибку уже завершившейся задачи не пробрасываем: её результат
+    не понадобился, а исключение не должно подменять основное.
+    
+    Args:
+        task (asyncio.Task): Задача для отмены
+    """
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError, Exception):
+        await task
 
 
 # === Основная функция ===
@@ -271,6 +517,8 @@ async def get_vacancies_async(
         order_by: Optional[str] = None,
         required_skills: Optional[List[str]] = None,
         show_progress: bool = True,
+        session: Optional[aiohttp.ClientSession] = None,
+        prefilter_skills: bool = False,
 ) -> Tuple[List[Dict], int]:
     """
     Основная функция для получения вакансий с фильтрацией.
@@ -278,8 +526,8 @@ async def get_vacancies_async(
     Функция выполняет следующие действия:
     1. Подключается к базе данных для отслеживания обработанных вакансий
     2. Получает общее количество вакансий по запросу
-    3. Постранично загружает вакансии
-    4. Фильтрует уже обработанные вакансии
+    3. Параллельно загружает страницы вакансий, пока не наберётся нужное количество
+    4. Фильтрует уже обработанные и повторяющиеся вакансии
     5. При необходимости загружает детальную информацию и фильтрует по навыкам
     6. Возвращает результат и общее количество найденных вакансий
     
@@ -290,6 +538,11 @@ async def get_vacancies_async(
         order_by (Optional[str]): Сортировка результатов
         required_skills (Optional[List[str]]): Список требуемых навыков для фильтрации
         show_progress (bool): Показывать прогресс-бар
+        session (Optional[aiohttp.ClientSession]): Сессия из create_session() для
+            переиспользования соединений между вызовами; если не передана,
+            создаётся и закрывается внутри функции
+        prefilter_skills (bool): Запрашивать детали только для вакансий, в кратких
+            данных которых упомянут хотя бы один требуемый навык (см. mentions_any_skill)
         
     Returns:
         Tuple[List[Dict], int]: (список вакансий, общее количество найденных)
@@ -307,12 +560,21 @@ async def get_vacancies_async(
     """
     data: List[Dict] = []
 
+    # Приводим навыки к нижнему регистру один раз, а не для каждой вакансии
+    if required_skills:
+        required_skills = frozenset(skill.lower() for skill in required_skills)
+
     # Инициализируем базу данных для отслеживания обработанных вакансий
     db = DBVacanciesManager()
     db.create_processed_urls_table()
-    seen_ids = set(db.get_all_processed_ids())
-
-    async with aiohttp.ClientSession(headers={"User-Agent": "my-hh-bot"}) as session:
+    db.create_details_cache_table(settings.details_cache_ttl)
+    seen_ids = db.get_all_processed_ids()
+
+    async with contextlib.AsyncExitStack() as stack:
+        stack.callback(db.close)
+        # Без переданной сессии создаём собственную и закрываем её по завершении
+        if session is None:
+            session = await stack.enter_async_context(create_session())
         client = HHClient(session)
 
         # Получаем общее количество вакансий
@@ -320,40 +582,69 @@ async def get_vacancies_async(
         logger.info(f"Всего найдено: {total_found}")
 
         page = 0
+        total_pages = math.ceil(total_found / settings.per_page)
         prev_count = 0
         processed_count = 0
-
-        # Постранично загружаем вакансии
-        while len(data) < max_vacancies and page * settings.per_page < total_found:
-            # Загружаем страницу вакансий
-            vacancies = await client.fetch_page(keyword, search_field, page, order_by)
+        # Задача с заранее запрошенной первой страницей следующей пачки
+        prefetch: Optional[asyncio.Task] = None
+
+        # Загружаем вакансии пачками страниц
+        while len(data) < max_vacancies and page < total_pages:
+            # Параллельно запрашиваем столько страниц, сколько нужно для добора недостающих вакансий
+            pages_count = min(math.ceil((max_vacancies - len(data)) / settings.per_page), total_pages - page)
+            pages = range(page, page + pages_count)
+            if prefetch is not None:
+                first, rest = await asyncio.gather(
+                    prefetch, client.fetch_pages(keyword, search_field, pages[1:], order_by)
+                )
+                vacancies = first + rest
+            else:
+                vacancies = await client.fetch_pages(keyword, search_field, pages, order_by)
             processed_count += len(vacancies)
 
-            # Фильтруем уже обработанные вакансии
-            vacancies = [v for v in vacancies if int(v["id"]) not in seen_ids]
-
-            exclude_words = {"преподава", "репетитор", "педагог", "учите", "аналитик", "c#", "c++", "frontend"}
-
-            vacancies = [
-                v for v in vacancies
-                if not any(word in v["name"].lower() for word in exclude_words)
-            ]
+            # Пока грузятся детали текущей пачки, запрашиваем следующую страницу
+            prefetch = None
+            if required_skills and page + pages_count < total_pages:
+                prefetch = asyncio.create_task(
+                    client.fetch_page(keyword, search_field, page + pages_count, order_by)
+                )
+                # Если страница не понадобится, задача отменяется и завершается при выходе,
+                # чтобы не остаться висеть в общем для всех поисков цикле событий
+                stack.push_async_callback(_cancel_task, prefetch)
+
+            # Фильтруем уже обработанные вакансии и вакансии, уже встречавшиеся
+            # в этом поиске (HH может вернуть одну вакансию на разных страницах)
+            fresh = []
+            for vacancy in vacancies:
+                vacancy_id = int(vacancy["id"])
+                if vacancy_id not in seen_ids:
+                    seen_ids.add(vacancy_id)
+                    fresh.append(vacancy)
+            vacancies = fresh
+
+            # Отбрасываем вакансии с исключёнными словами в названии
+            vacancies = [v for v in vacancies if not _EXCLUDE_RE.search(v["name"].lower())]
 
             if required_skills:
+                if prefilter_skills:
+                    # Не запрашиваем детали вакансий, где навыки не упоминаются вовсе
+                    vacancies = [v for v in vacancies if mentions_any_skill(v, required_skills)]
+
                 # Если указаны требуемые навыки, загружаем детальную информацию
+                # и фильтруем по ней вакансии по мере получения ответов.
+                # Когда вакансий достаточно, оставшиеся запросы отменяются.
+                details = iter_details_cached(client, db, vacancies, show_progress)
                 try:
-                    details = await client.fetch_details_batch(vacancies, show_progress)
+                    async for vacancy, detail in details:
+                        if detail and has_required_skills(detail, required_skills):
+                            data.append(parse_vacancy(vacancy, detail))
+                            if len(data) >= max_vacancies:
+                                break
                 except CaptchaRequired:
                     logger.error("🔒 Требуется капча. Завершаем выполнение.")
                     break
-
-                # Фильтруем вакансии по требуемым навыкам
-                filtered = (
-                    parse_vacancy(vac, det)
-                    for vac, det in zip(vacancies, details)
-                    if det and has_required_skills(det, required_skills)
-                )
-                data.extend(filtered)
+                finally:
+                    await details.aclose()
             else:
                 # Если навыки не указаны, добавляем все вакансии
                 data.extend(parse_vacancy(v) for v in vacancies)
@@ -365,7 +656,7 @@ async def get_vacancies_async(
                 f"Обработано: {processed_count} из {total_found}"
             )
             prev_count = len(data)
-            page += 1
+            page += pages_count
 
     print(f"Загружено {len(data)} из {total_found}")
     return data[:max_vacancies], total_found
@@ -1,12 +1,19 @@
-import pandas as pd
+import csv
 from datetime import datetime
 from typing import List, Dict, Optional
 
+from openpyxl import Workbook
+
+EXPORT_HEADERS = ('Название вакансии', 'Ссылка')
+
 
 def export_vacancies(vacancies: List[Dict], file_format: str = "csv", filename: Optional[str] = None) -> str:
     """
     Экспортирует вакансии в CSV или Excel файл.
 
+    Строки пишутся в файл по одной, без промежуточного DataFrame:
+    CSV через csv.writer, Excel через openpyxl в режиме write_only.
+
     Аргументы:
     - vacancies: список словарей с вакансиями
     - file_format: 'csv' или 'xlsx' (по умолчанию 'csv')
@@ -22,16 +29,20 @@ def export_vacancies(vacancies: List[Dict], file_format: str = "csv", filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"vacancies_{timestamp}.{file_format}"
 
-    # Преобразуем данные в формат DataFrame
-    df = pd.DataFrame([{
-        'Название вакансии': v['vacancy_name'],
-        'Ссылка': f"https://hh.ru/vacancy/{v['id']}"
-    } for v in vacancies])
+    rows = ((v['vacancy_name'], f"https://hh.ru/vacancy/{v['id']}") for v in vacancies)
 
     # Сохраняем файл в нужном формате
     if file_format == "csv":
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        with open(filename, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_HEADERS)
+            writer.writerows(rows)
     else:
-        df.to_excel(filename, index=False)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Sheet1")
+        ws.append(EXPORT_HEADERS)
+        for row in rows:
+            ws.append(row)
+        wb.save(filename)
 
     return filename
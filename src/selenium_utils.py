@@ -15,11 +15,19 @@
 """
 
 import asyncio
+import atexit
+import itertools
 import os
-import pickle
-from functools import lru_cache
+import queue
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+import orjson
+from dotenv import load_dotenv
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import JavascriptException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -27,6 +35,8 @@ from selenium.webdriver.chrome.options import Options
 
 from src.DBManager import DBVacanciesManager
 
+load_dotenv()
+
 # Конфигурация Chrome драйвера для headless режима
 options = Options()
 options.add_argument("--headless=new")  # Новый headless режим Chrome
@@ -34,7 +44,16 @@ options.add_argument("--disable-gpu")  # Отключение GPU для ста
 options.add_argument("--window-size=1920,1080")  # Размер окна браузера
 options.add_argument("--no-sandbox")  # Отключение sandbox для Docker
 options.add_argument("--disable-dev-shm-usage")  # Отключение /dev/shm
-options.page_load_strategy = 'eager'  # Стратегия загрузки страницы
+options.add_argument("--blink-settings=imagesEnabled=false")  # Не декодировать изображения
+options.add_argument("--disable-extensions")  # Без расширений
+options.add_argument("--disable-background-networking")  # Без фоновых запросов Chrome
+options.add_argument("--disable-sync")  # Без синхронизации профиля
+options.add_argument("--disable-default-apps")  # Без встроенных приложений
+options.add_argument("--mute-audio")  # Без звука
+options.add_argument("--disable-features=Translate,BackForwardCache")  # Без переводчика и кэша истории
+options.add_argument("--log-level=3")  # Только фатальные ошибки в логе Chrome
+# driver.get не ждет загрузки страницы: готовность определяется по нужным элементам
+options.page_load_strategy = 'none'
 # Отключение загрузки изображений, CSS и шрифтов для ускорения
 options.add_experimental_option("prefs", {
     "profile.managed_default_content_settings.images": 2,
@@ -42,27 +61,133 @@ options.add_experimental_option("prefs", {
     "profile.managed_default_content_settings.fonts": 2,
 })
 
+# Ресурсы, запросы к которым headless браузер отменяет до отправки в сеть (через CDP)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.css",
+    "*google-analytics.com*", "*googletagmanager.com*", "*mc.yandex.ru*", "*doubleclick.net*",
+]
+
 # Константы конфигурации
 LETTER_TEMPLATE_PATH = os.getenv("LETTER_TEMPLATE_PATH", "src/cover_letter.txt")
 PAGE_TIMEOUT = int(os.getenv("PAGE_TIMEOUT", 5))
+POLL_FREQUENCY = float(os.getenv("POLL_FREQUENCY", 0.1))
+LOGIN_TIMEOUT = int(os.getenv("LOGIN_TIMEOUT", 300))
+COOKIES_PATH = "cookies.json"
+MAX_USES_PER_DRIVER = int(os.getenv("MAX_USES_PER_DRIVER", 100))
+
+# Локаторы и условия ожидания строятся один раз при импорте, а не на каждую вакансию.
+ALREADY_APPLIED_XPATH = '//*[translate(normalize-space(.), "\u00A0", " ")="Вы откликнулись"]'
+REJECTED_XPATH = '//*[contains(@class, "magritte-text") and contains(text(), "Вам отказали")]'
+SKIP_XPATH = f"{ALREADY_APPLIED_XPATH} | {REJECTED_XPATH}"
+REJECTED_TEXT = "Вам отказали"
+APPLY_BUTTON_XPATH = ('//div[not(@data-qa="vacancy-serp__vacancy") and contains'
+                      '(@class, "magritte-card")]//span[text()="Откликнуться"]')
+# Сообщения для статусов пропуска вакансии
+SKIP_MESSAGES = {"already_applied": "Уже откликнулись", "rejected": "Отказ"}
+# Проверка страницы вакансии за один вызов execute_script: отметки о пропуске ищутся
+# объединением XPath, доступная кнопка "Откликнуться" сразу нажимается.
+# Возвращает "already_applied", "rejected", "clicked" или null, если страница не готова.
+APPLY_PAGE_SCRIPT = """
+const first = xpath => document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const mark = first(arguments[0]);
+if (mark) return mark.textContent.includes(arguments[1]) ? "rejected" : "already_applied";
+const button = first(arguments[2]);
+if (!button || !button.getClientRects().length) return null;
+if ((button.closest("button") || button).disabled) return null;
+button.click();
+return "clicked";
+"""
+RELOCATE_BUTTON_XPATH = '//span[text()="Все равно откликнуться"]/ancestor::button'
+COVER_LETTER_LABEL_XPATH = '//label[contains(text(), "Сопроводительное письмо")]'
+# Ожидание формы письма после нажатия "Откликнуться": если вместо нее появилось
+# предупреждение с кнопкой "Все равно откликнуться", скрипт нажимает эту кнопку.
+# Возвращает true, когда форма письма на странице, иначе null.
+LETTER_FORM_SCRIPT = """
+const first = xpath => document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (first(arguments[0])) return true;
+const relocate = first(arguments[1]);
+if (relocate && !relocate.disabled && relocate.getClientRects().length) relocate.click();
+return null;
+"""
+# Поиск поля сопроводительного письма (textarea, связанная с label через aria-labelledby)
+# и ввод текста за один вызов execute_script вместо посимвольного send_keys.
+# Значение ставится через нативный setter, а события input и change сообщают о нем
+# React-обработчикам и проверкам формы.
+# Возвращает true, если поле найдено и заполнено, или null, если формы еще нет.
+FILL_COVER_LETTER_SCRIPT = """
+const label = document.evaluate(
+    arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!label || !label.id) return null;
+const field = document.querySelector(`textarea[aria-labelledby="${CSS.escape(label.id)}"]`);
+if (!field) return null;
+Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, "value").set.call(field, arguments[1]);
+field.dispatchEvent(new Event("input", {bubbles: true}));
+field.dispatchEvent(new Event("change", {bubbles: true}));
+return true;
+"""
+SUBMIT_BUTTON_CLICKABLE = EC.element_to_be_clickable(
+    (By.XPATH, '//button[.//span[text()="Отправить"]]'))
+
+
+# Cookies, прочитанные из COOKIES_PATH: один разбор файла на все браузеры
+_cookies = None
 
 
 def save_cookies(w):
     """
     Сохраняет cookies для авторизации на hh.ru
     
-    Функция открывает браузер, переходит на страницу входа и ждет
-    ручного входа пользователя. После входа сохраняет cookies в файл
-    для последующего использования в автоматических откликах.
+    Функция открывает браузер на странице входа и ждет, пока пользователь
+    войдет в аккаунт: вход считается завершенным, когда браузер уходит
+    со страницы /account/login (не дольше LOGIN_TIMEOUT секунд).
+    После входа cookies сохраняются в файл для последующего
+    использования в автоматических откликах, а браузеры из пулов
+    с прежними cookies закрываются.
     
-    Файл cookies.pkl создается в текущей директории.
+    Файл cookies.json создается в текущей директории.
     """
+    global _cookies
     driver = webdriver.Chrome()
-    driver.get("https://hh.ru/account/login")
-    input("Войдите в аккаунт и нажмите Enter...")
-    with open("cookies.pkl", "wb") as file:
-        pickle.dump(driver.get_cookies(), file)
-    driver.quit()
+    try:
+        driver.get("https://hh.ru/account/login")
+        print(f"Войдите в аккаунт в открывшемся браузере (ожидание до {LOGIN_TIMEOUT} с)...")
+        try:
+            WebDriverWait(driver, LOGIN_TIMEOUT, poll_frequency=0.5).until_not(
+                EC.url_contains("account/login"))
+        except TimeoutException:
+            print("❌ Вход не выполнен за отведенное время, cookies не сохранены")
+            return
+        cookies = driver.get_cookies()
+        with open(COOKIES_PATH, "wb") as file:
+            file.write(orjson.dumps(cookies))
+        _cookies = cookies
+        # Браузеры в пулах авторизованы прежними cookies: закрываем их,
+        # и следующий запуск откликов создаст браузеры уже с новыми
+        for pool in _driver_pools.values():
+            pool.close()
+        print("✅ Cookies сохранены")
+    finally:
+        driver.quit()
+
+
+def read_cookies():
+    """
+    Возвращает сохраненные cookies
+
+    Returns:
+        list: Список cookies в формате Selenium
+
+    Файл читается только при первом вызове, дальше используется
+    уже разобранный список.
+    """
+    global _cookies
+    if _cookies is None:
+        with open(COOKIES_PATH, "rb") as file:
+            _cookies = orjson.loads(file.read())
+    return _cookies
 
 
 def load_cookies(driver):
@@ -72,14 +197,44 @@ def load_cookies(driver):
     Args:
         driver: Экземпляр WebDriver для загрузки cookies
         
-    Функция загружает cookies из файла cookies.pkl и применяет их
-    к текущей сессии браузера для автоматической авторизации.
+    Функция берет cookies из файла cookies.json и передает их браузеру
+    одной командой CDP Network.setCookies. Открывать hh.ru для этого
+    не нужно: первая же загруженная вакансия уже будет авторизована.
+    """
+    cookies = []
+    for cookie in read_cookies():
+        # В CDP срок действия cookie называется expires, а не expiry
+        cookie = dict(cookie)
+        if "expiry" in cookie:
+            cookie["expires"] = cookie.pop("expiry")
+        cookies.append(cookie)
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+
+def page_wait(driver):
     """
-    driver.get("https://hh.ru")
-    with open("cookies.pkl", "rb") as file:
-        for cookie in pickle.load(file):
-            driver.add_cookie(cookie)
-    driver.refresh()
+    Создает ожидание элементов страницы с общими настройками модуля
+
+    Args:
+        driver: Экземпляр WebDriver
+
+    Returns:
+        WebDriverWait: Ожидание на PAGE_TIMEOUT секунд с опросом страницы
+            каждые POLL_FREQUENCY секунд (по умолчанию Selenium опрашивает
+            раз в 0.5 секунды, и готовая страница замечается с задержкой)
+    """
+    return WebDriverWait(driver, PAGE_TIMEOUT, poll_frequency=POLL_FREQUENCY,
+                         ignored_exceptions=(JavascriptException,))
+
+
+def _apply_page_state(driver):
+    """
+    Условие ожидания для страницы вакансии (см. APPLY_PAGE_SCRIPT)
+
+    Returns:
+        str or None: Статус страницы или None, если она еще не готова
+    """
+    return driver.execute_script(APPLY_PAGE_SCRIPT, SKIP_XPATH, REJECTED_TEXT, APPLY_BUTTON_XPATH)
 
 
 def check_and_click_apply(driver):
@@ -99,48 +254,23 @@ def check_and_click_apply(driver):
     1. Проверяет, не откликались ли уже на эту вакансию
     2. Проверяет, не получили ли отказ по этой вакансии
     3. Если проверки пройдены - нажимает кнопку "Откликнуться"
-    4. Обрабатывает возможное появление кнопки "Все равно откликнуться"
+    4. Дожидается формы письма, при необходимости нажимая "Все равно откликнуться"
     """
     try:
-        # Список проверок для пропуска вакансий
-        skip_checks = [
-            {
-                "xpath": '//*[translate(normalize-space(.), "\u00A0", " ")="Вы откликнулись"]',
-                "reason": "already_applied",
-                "message": "Уже откликнулись"
-            },
-            {
-                "xpath": '//*[contains(@class, "magritte-text") and contains(text(), "Вам отказали")]',
-                "reason": "rejected",
-                "message": "Отказ"
-            }
-        ]
-
-        # Проверяем каждое условие для пропуска
-        for check in skip_checks:
-            if driver.find_elements(By.XPATH, check["xpath"]):
-                return False, check["reason"], check["message"]
-
-        # Ищем и нажимаем кнопку "Откликнуться"
-        apply_button = WebDriverWait(driver, 2).until(
-            EC.element_to_be_clickable((
-                By.XPATH,
-                '//div[not(@data-qa="vacancy-serp__vacancy") and contains'
-                '(@class, "magritte-card")]//span[text()="Откликнуться"]'
-            ))
+        # Страница грузится без ожидания, поэтому ждем появления нужных элементов.
+        # Доступная кнопка "Откликнуться" нажимается тем же скриптом
+        status = page_wait(driver).until(_apply_page_state)
+
+        # Проверяем условие для пропуска
+        if status in SKIP_MESSAGES:
+            return False, status, SKIP_MESSAGES[status]
+
+        # Ждем форму письма, по пути нажимая "Все равно откликнуться", если она появится.
+        # Раньше на эту кнопку всегда тратилась отдельная секунда ожидания
+        page_wait(driver).until(
+            lambda d: d.execute_script(LETTER_FORM_SCRIPT, COVER_LETTER_LABEL_XPATH,
+                                       RELOCATE_BUTTON_XPATH)
         )
-        apply_button.click()
-
-        # Обрабатываем возможную кнопку "Все равно откликнуться"
-        try:
-            relocate_button = WebDriverWait(driver, 1).until(
-                EC.element_to_be_clickable(
-                    (By.XPATH, '//span[text()="Все равно откликнуться"]/ancestor::button'))
-            )
-            relocate_button.click()
-        except TimeoutException:
-            # Кнопка не появилась - это нормально
-            pass
 
         return True, "applied", "✅ Кнопка отклика нажата"
 
@@ -148,7 +278,6 @@ def check_and_click_apply(driver):
         return False, "error", "❌ Не удалось найти кнопку отклика"
 
 
-@lru_cache
 def load_letter_template(path=LETTER_TEMPLATE_PATH):
     """
     Загружает шаблон сопроводительного письма из файла
@@ -159,8 +288,8 @@ def load_letter_template(path=LETTER_TEMPLATE_PATH):
     Returns:
         str or None: Содержимое шаблона или None в случае ошибки
         
-    Использует декоратор @lru_cache для кэширования шаблона
-    и избежания повторного чтения файла.
+    Вызывается один раз при импорте модуля, результат хранится
+    в константе LETTER_TEMPLATE.
     """
     try:
         with open(path, encoding='utf-8') as f:
@@ -170,6 +299,32 @@ def load_letter_template(path=LETTER_TEMPLATE_PATH):
         return None
 
 
+def compile_letter_template(template):
+    """
+    Готовит шаблон письма к многократной подстановке
+
+    Args:
+        template (str or None): Текст шаблона
+
+    Returns:
+        callable or None: Функция name -> письмо или None, если шаблона нет
+
+    Если кроме {vacancy_name} в шаблоне нет фигурных скобок, он один раз
+    разбивается по этому полю, и письмо собирается склейкой частей без
+    разбора шаблона методом format(). Иначе используется format().
+    """
+    if template is None:
+        return None
+    parts = template.split("{vacancy_name}")
+    if not any("{" in part or "}" in part for part in parts):
+        return lambda name: name.join(parts)
+    return lambda name: template.format(vacancy_name=name)
+
+
+LETTER_TEMPLATE = load_letter_template()
+_render_letter = compile_letter_template(LETTER_TEMPLATE)
+
+
 def generate_cover_letter(name):
     """
     Генерирует сопроводительное письмо на основе шаблона
@@ -180,11 +335,10 @@ def generate_cover_letter(name):
     Returns:
         str or None: Сгенерированное письмо или None если шаблон не найден
         
-    Подставляет название вакансии в шаблон письма используя
-    метод format() с параметром vacancy_name.
+    Подставляет название вакансии в шаблон письма, подготовленный
+    функцией compile_letter_template.
     """
-    template = load_letter_template()
-    return template.format(vacancy_name=name) if template else None
+    return _render_letter(name) if _render_letter else None
 
 
 def fill_and_submit_cover_letter(driver, name):
@@ -202,33 +356,24 @@ def fill_and_submit_cover_letter(driver, name):
             - message (str): Описательное сообщение о результате
             
     Функция выполняет следующие действия:
-    1. Находит поле для ввода сопроводительного письма
-    2. Генерирует письмо на основе шаблона
-    3. Заполняет поле текстом письма
-    4. Нажимает кнопку "Отправить"
+    1. Генерирует письмо на основе шаблона
+    2. Находит поле для ввода сопроводительного письма и заполняет его
+       текстом письма (одним скриптом, см. FILL_COVER_LETTER_SCRIPT)
+    3. Нажимает кнопку "Отправить"
     """
     try:
-        # Ищем label для сопроводительного письма
-        label = WebDriverWait(driver, PAGE_TIMEOUT).until(
-            EC.presence_of_element_located((By.XPATH, '//label[contains(text(), "Сопроводительное письмо")]'))
-        )
-        label_id = label.get_attribute("id")
-
-        # Находим textarea по aria-labelledby атрибуту
-        textarea = driver.find_element(By.XPATH, f'//textarea[@aria-labelledby="{label_id}"]')
         letter = generate_cover_letter(name)
 
         if not letter:
             return False, "error", "⏭ Пропущено: шаблон не найден"
 
-        # Очищаем поле и вводим текст письма
-        textarea.clear()
-        textarea.send_keys(letter)
+        # Ждем появления поля для письма и сразу заполняем его
+        page_wait(driver).until(
+            lambda d: d.execute_script(FILL_COVER_LETTER_SCRIPT, COVER_LETTER_LABEL_XPATH, letter)
+        )
 
         # Находим и нажимаем кнопку "Отправить"
-        submit = WebDriverWait(driver, PAGE_TIMEOUT).until(
-            EC.element_to_be_clickable((By.XPATH, '//button[.//span[text()="Отправить"]]'))
-        )
+        submit = page_wait(driver).until(SUBMIT_BUTTON_CLICKABLE)
         submit.click()
         return True, "applied", "✅ Письмо отправлено"
 
@@ -260,6 +405,11 @@ def process_single_vacancy(driver, vacancy):
     """
     try:
         driver.get(f"https://hh.ru/vacancy/{vacancy['id']}")
+        # При page_load_strategy='none' get возвращается сразу, и в окне еще может быть
+        # предыдущая вакансия: ждем, пока браузер перейдет на новую страницу
+        page_wait(driver).until(
+            EC.url_matches(rf"/vacancy/{vacancy['id']}(?:[/?#]|$)")
+        )
 
         # Пытаемся откликнуться на вакансию
         success, status, message = check_and_click_apply(driver)
@@ -276,10 +426,153 @@ def process_single_vacancy(driver, vacancy):
         return False, "error", f"❌ Ошибка: {vacancy['vacancy_name']} ({e})"
 
 
-def apply_to_vacancy_batch(vacancies, final_stats, shadow, db_path="vacancies.db"):
-    driver = webdriver.Chrome(options=options if shadow else None)
-    load_cookies(driver)
+class DriverPool:
+    """
+    Пул запущенных браузеров с уже загруженными cookies
 
+    Запуск Chrome и авторизация занимают несколько секунд, поэтому
+    браузеры не закрываются после пакета, а возвращаются в пул и
+    переиспользуются следующими пакетами и запусками откликов.
+    Новый браузер создается, только если все существующие заняты.
+
+    Если задан blocked_urls, браузер сразу после запуска отменяет запросы
+    по этим шаблонам (картинки, шрифты, аналитика) на уровне сети.
+
+    Браузер закрывается и заменяется новым после max_uses открытых
+    вакансий (чтобы не копилась память), если во время работы
+    с ним возникло исключение или если перед выдачей из пула он
+    не отвечает (Chrome упал или пользователь закрыл окно).
+    """
+
+    def __init__(self, driver_options=None, blocked_urls=(), max_uses=MAX_USES_PER_DRIVER):
+        self.driver_options = driver_options
+        self.blocked_urls = list(blocked_urls)
+        self.max_uses = max_uses
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def _create_driver(self):
+        driver = webdriver.Chrome(options=self.driver_options)
+        try:
+            if self.blocked_urls:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+            load_cookies(driver)
+        except Exception:
+            driver.quit()
+            raise
+        with self._lock:
+            self._uses[driver] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            # Браузер мог уже упасть - закрывать нечего
+            pass
+
+    @staticmethod
+    def _is_alive(driver):
+        """Проверяет, что сессия браузера жива и его текущее окно открыто"""
+        try:
+            driver.current_window_handle
+        except Exception:
+            return False
+        return True
+
+    @contextmanager
+    def acquire(self):
+        """
+        Выдает свободный браузер и возвращает его в пул после использования
+
+        Yields:
+            WebDriver: Авторизованный экземпляр браузера
+        """
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._create_driver()
+                break
+            # process_single_vacancy перехватывает все ошибки, поэтому упавший
+            # браузер возвращается в пул: проверяем его перед повторной выдачей
+            if self._is_alive(driver):
+                break
+            self._discard(driver)
+
+        try:
+            yield driver
+        except BaseException:
+            self._discard(driver)
+            raise
+
+        with self._lock:
+            uses = self._uses.get(driver)
+            if uses is None:
+                # Пул закрыли, пока браузер был занят: он уже остановлен
+                return
+            self._uses[driver] = uses = uses + 1
+        if uses >= self.max_uses:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    def close(self):
+        """Закрывает все браузеры пула"""
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            drivers = list(self._uses)
+        for driver in drivers:
+            self._discard(driver)
+
+
+# Пулы браузеров по режиму запуска (headless / с окном), создаются при первом отклике
+_driver_pools = {}
+
+
+def get_driver_pool(shadow):
+    """
+    Возвращает пул браузеров для указанного режима запуска
+
+    Args:
+        shadow (bool): True - headless режим, False - браузер с окном
+
+    Returns:
+        DriverPool: Пул, который закрывается при завершении программы
+            (пул браузеров с окном закрывается еще и после каждого запуска откликов)
+    """
+    pool = _driver_pools.get(shadow)
+    if pool is None:
+        pool = _driver_pools[shadow] = (
+            DriverPool(options, BLOCKED_URL_PATTERNS) if shadow else DriverPool()
+        )
+        atexit.register(pool.close)
+    return pool
+
+
+def apply_to_vacancy_batch(jobs, total, progress, pool, db_path="vacancies.db"):
+    """
+    Откликается на вакансии из общей очереди в отдельном потоке, пока она не опустеет
+
+    Args:
+        jobs (queue.SimpleQueue): Общая для всех потоков очередь вакансий
+        total (int): Общее количество вакансий (для вывода прогресса)
+        progress (itertools.count): Общий для всех потоков счетчик обработанных вакансий
+        pool (DriverPool): Пул браузеров
+        db_path (str): Путь к базе данных с обработанными вакансиями
+
+    Returns:
+        Counter: Статистика потока по статусам
+            ("applied", "already_applied", "rejected", "errors")
+    """
     db = DBVacanciesManager(db_path)
     db.create_processed_urls_table()
 
@@ -287,8 +580,14 @@ def apply_to_vacancy_batch(vacancies, final_stats, shadow, db_path="vacancies.db
     processed_id = []
 
     try:
-        for idx, vacancy in enumerate(vacancies, 1):
-            success, status, message = process_single_vacancy(driver, vacancy)
+        while True:
+            try:
+                vacancy = jobs.get_nowait()
+            except queue.Empty:
+                break
+
+            with pool.acquire() as driver:
+                success, status, message = process_single_vacancy(driver, vacancy)
 
             if status != "error":
                 processed_id.append(vacancy["id"])
@@ -302,19 +601,46 @@ def apply_to_vacancy_batch(vacancies, final_stats, shadow, db_path="vacancies.db
             else:
                 errors += 1
 
-            print(
+            # Строка статуса выводится одним вызовом write: print пишет текст и перевод
+            # строки отдельно, и вывод параллельных потоков мог перемешиваться
+            idx = next(progress)
+            sys.stdout.write(
                 f"\n{message}"
-                f"\n📊 {idx}/{len(vacancies)} "
+                f"\n📊 {idx}/{total} "
                 f"| ✅ Новые: {applied} | ⏭ Уже были: {already_applied} "
-                f"| ❌ Отказ: {rejected} | 🛑 Ошибки: {errors}")
+                f"| ❌ Отказ: {rejected} | 🛑 Ошибки: {errors}\n")
 
     finally:
         db.insert_processed_ids_bulk(processed_id)
-        final_stats["applied"] += applied
-        final_stats["already_applied"] += already_applied
-        final_stats["rejected"] += rejected
-        final_stats["errors"] += errors
-        driver.quit()
+        db.close()
+
+    # Каждый поток возвращает свою статистику вместо изменения общего словаря
+    return Counter(applied=applied, already_applied=already_applied,
+                   rejected=rejected, errors=errors)
+
+
+def drop_processed_vacancies(vacancies, db_path="vacancies.db"):
+    """
+    Убирает вакансии, которые уже обрабатывались в прошлых запусках откликов
+
+    Args:
+        vacancies (list): Список словарей с информацией о вакансиях
+        db_path (str): Путь к базе данных с обработанными вакансиями
+
+    Returns:
+        list: Вакансии, которых нет в таблице processed_urls
+
+    Для таких вакансий браузер только открыл бы страницу и увидел
+    "Вы откликнулись" или "Вам отказали", поэтому они отсекаются
+    по локальной базе еще до запуска Selenium.
+    """
+    db = DBVacanciesManager(db_path)
+    try:
+        db.create_processed_urls_table()
+        processed = db.get_all_processed_ids()
+    finally:
+        db.close()
+    return [v for v in vacancies if int(v["id"]) not in processed]
 
 
 async def apply_to_vacancies_parallel_batched(vacancies, shadow=True, max_parallel_drivers=3):
@@ -323,30 +649,47 @@ async def apply_to_vacancies_parallel_batched(vacancies, shadow=True, max_parall
     
     Args:
         vacancies (list): Список словарей с информацией о вакансиях
-        shadow (bool): Список словарей с информацией о вакансиях
-        max_parallel_drivers (int):
+        shadow (bool): True - браузеры в headless режиме
+        max_parallel_drivers (int): Количество параллельно работающих браузеров
         
-    Функция разделяет все вакансии на пакеты и обрабатывает их
-    параллельно с использованием max_parallel_drivers браузеров.
+    Все вакансии помещаются в общую очередь, из которой их разбирают
+    max_parallel_drivers потоков: освободившийся поток сразу берет
+    следующую вакансию, а не простаивает, пока другие дорабатывают
+    заранее выделенные им пакеты.
     
     В конце выводит итоговую статистику по всем обработанным вакансиям.
     
     Пример использования:
         await apply_to_vacancies_parallel_batched(vacancies_list)
     """
-    # Вычисляем размер пакета для равномерного распределения
-    batch_size = (len(vacancies) + max_parallel_drivers - 1) // max_parallel_drivers
-    batches = [vacancies[i:i + batch_size] for i in range(0, len(vacancies), batch_size)]
-
-    # Инициализируем общую статистику
-    final_stats = {"applied": 0, "already_applied": 0, "rejected": 0, "errors": 0}
-
-    async def run_batch(batch):
-        """Внутренняя функция для запуска пакета в отдельном потоке"""
-        return await asyncio.to_thread(apply_to_vacancy_batch, batch, final_stats, shadow)
-
-    # Запускаем все пакеты параллельно
-    await asyncio.gather(*[run_batch(batch) for batch in batches])
+    pending = drop_processed_vacancies(vacancies)
+    if len(pending) < len(vacancies):
+        print(f"⏭ Пропущено ранее обработанных вакансий: {len(vacancies) - len(pending)}")
+    if not pending:
+        print("Нет новых вакансий для отклика.")
+        return
+    vacancies = pending
+
+    jobs = queue.SimpleQueue()
+    for vacancy in vacancies:
+        jobs.put(vacancy)
+    progress = itertools.count(1)
+    pool = get_driver_pool(shadow)
+
+    async def run_worker():
+        """Внутренняя функция для запуска обработчика очереди в отдельном потоке"""
+        return await asyncio.to_thread(
+            apply_to_vacancy_batch, jobs, len(vacancies), progress, pool)
+
+    # Запускаем обработчики параллельно и суммируем их статистику
+    workers = min(max_parallel_drivers, len(vacancies))
+    try:
+        final_stats = sum(await asyncio.gather(*[run_worker() for _ in range(workers)]), Counter())
+    finally:
+        if not shadow:
+            # Окна Chrome не оставляем висеть до выхода из программы:
+            # между запусками переиспользуются только скрытые браузеры
+            pool.close()
 
     # Выводим итоговую статистику
     print(f"\n🎯 Финальный результат: из {len(vacancies)}")
@@ -10,15 +10,84 @@
 """
 
 import asyncio
+import atexit
 import os
+import sys
 from typing import Optional, Callable, List
 
-from src.Request_func import get_vacancies_async
-from src.data_utils import export_vacancies
-from src.selenium_utils import apply_to_vacancies_parallel_batched
+from dotenv import load_dotenv
+
+# Модули с aiohttp, openpyxl и Selenium импортируются внутри обработчиков:
+# их загрузка занимает сотни миллисекунд, а нужны они только для своих пунктов меню
+load_dotenv()
 
 MAX_PARALLEL_ALLOWED = int(os.getenv("MAX_PARALLEL_ALLOWED", 5))
 
+# Соответствие пунктов меню параметрам поиска и форматам экспорта
+SEARCH_FIELDS = {1: "name", 2: "description"}
+ORDER_BY = {1: None, 2: "publication_time"}
+EXPORT_FORMATS = {"1": "csv", "2": "xlsx"}
+# Пункты меню откликов: номер -> (скрытый режим, запрашивать число потоков)
+APPLY_MODES = {1: (True, False), 2: (False, False), 3: (True, True), 4: (False, True)}
+
+# Один цикл событий и одна HTTP-сессия на все действия меню: соединения с api.hh.ru
+# и кэш DNS переживают между поисками, а не создаются заново в каждом asyncio.run
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_session = None
+
+
+def run_async(coro):
+    """
+    Выполняет корутину в общем для всех действий меню цикле событий.
+    Args:
+        coro: Корутина для выполнения.
+    Returns:
+        Результат корутины.
+    """
+
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    task = _loop.create_task(coro)
+    try:
+        return _loop.run_until_complete(task)
+    except KeyboardInterrupt:
+        # Отменяем незавершенную задачу и даем ей завершиться, иначе она
+        # продолжит выполняться при следующем запуске цикла
+        if not task.done():
+            task.cancel()
+            try:
+                _loop.run_until_complete(task)
+            except (asyncio.CancelledError, Exception):
+                pass
+        raise
+
+
+async def get_shared_session():
+    """
+    Возвращает общую HTTP-сессию, создавая ее при первом обращении.
+    Returns:
+        aiohttp.ClientSession: Сессия из create_session().
+    """
+
+    from src.Request_func import create_session
+
+    global _session
+    if _session is None or _session.closed:
+        _session = create_session()
+    return _session
+
+
+@atexit.register
+def _close_loop() -> None:
+    """Закрывает общую HTTP-сессию и цикл событий при выходе из программы."""
+
+    if _loop is None:
+        return
+    if _session is not None and not _session.closed:
+        _loop.run_until_complete(_session.close())
+    _loop.close()
+
 
 def get_input(prompt: str, cast: Callable, default: Optional = None) -> Optional:
     """
@@ -78,6 +147,9 @@ menus = {
     ],
 }
 
+# Тексты меню собираются один раз при импорте
+rendered_menus = {name: "\n" + "\n".join(lines) for name, lines in menus.items()}
+
 
 def print_menu(menu_type: str = "main") -> None:
     """
@@ -87,7 +159,7 @@ def print_menu(menu_type: str = "main") -> None:
                                    По умолчанию "main".
     """
 
-    print("\n" + "\n".join(menus.get(menu_type, [])))
+    print(rendered_menus.get(menu_type, "\n"))
 
 
 def print_vacancies(vacancies: List[dict], empty_message: str = "Нет вакансий") -> None:
@@ -102,15 +174,30 @@ def print_vacancies(vacancies: List[dict], empty_message: str = "Нет вака
     if not vacancies:
         print(empty_message)
         return
-    for i, v in enumerate(vacancies, 1):
-        print(
-            f"\n{i}. {v.get('vacancy_name', 'Без названия')}\n"
-            f"Ссылка: https://hh.ru/vacancy/{v['id']}"
-        )
+    # Весь список собирается в одну строку и выводится одним print
+    print("".join(
+        f"\n{i}. {v.get('vacancy_name', 'Без названия')}\n"
+        f"Ссылка: https://hh.ru/vacancy/{v['id']}\n"
+        for i, v in enumerate(vacancies, 1)
+    ), end="")
 
 
 # ==== Обработчики ====
 
+async def search_vacancies(**kwargs):
+    """
+    Ищет вакансии через общую HTTP-сессию.
+    Args:
+        **kwargs: Параметры get_vacancies_async (кроме session).
+    Returns:
+        Результат get_vacancies_async.
+    """
+
+    from src.Request_func import get_vacancies_async
+
+    return await get_vacancies_async(session=await get_shared_session(), **kwargs)
+
+
 def handle_search_and_save(writer) -> None:
     """
     Выполняет поиск вакансий через API hh.ru, очищает таблицу и сохраняет новые результаты.
@@ -124,17 +211,9 @@ def handle_search_and_save(writer) -> None:
 
     print_menu("search_field")
     search_field_choice = get_input("Введите поле поиска (по умолчанию 1): ", int, 1)
-    search_field_map = {
-        1: "name",
-        2: "description",
-    }
 
     print_menu("order_by")
     order_by_choice = get_input("Введите номер (по умолчанию 1): ", int, 1)
-    order_by_map = {
-        1: None,
-        2: "publication_time",
-    }
 
     skills_input = get_input(
         "\nВведите навыки для фильтрации по key_skills через запятую, например: Python, pandas."
@@ -146,16 +225,27 @@ def handle_search_and_save(writer) -> None:
         str,
         ""
     )
-    required_skills = [s.strip() for s in skills_input.split(",") if s.strip()] or None
+    required_skills = [skill for skill in map(str.strip, skills_input.split(",")) if skill] or None
+
+    prefilter_skills = False
+    if required_skills:
+        prefilter_input = get_input(
+            "\nЗапрашивать детали только для вакансий, где навык упомянут в названии или описании?"
+            "\nМеньше запросов к HH, но пропустит вакансии с навыком только в key_skills (y/N): ",
+            str,
+            ""
+        )
+        prefilter_skills = prefilter_input.lower() in ("y", "yes", "д", "да")
 
     try:
-        vacancies, _ = asyncio.run(
-            get_vacancies_async(
+        vacancies, _ = run_async(
+            search_vacancies(
                 keyword=keyword,
                 max_vacancies=max_vacancies,
-                search_field=search_field_map.get(search_field_choice, "name"),
-                order_by=order_by_map.get(order_by_choice),
-                required_skills=required_skills
+                search_field=SEARCH_FIELDS.get(search_field_choice, "name"),
+                order_by=ORDER_BY.get(order_by_choice),
+                required_skills=required_skills,
+                prefilter_skills=prefilter_skills
             )
         )
     except KeyboardInterrupt:
@@ -205,17 +295,30 @@ def handle_export(writer) -> None:
         return
 
     print_menu("export")
-    formats = {"1": "csv", "2": "xlsx"}
     choice = get_input("Введите номер формата: ", str)
-    file_format = formats.get(choice)
+    file_format = EXPORT_FORMATS.get(choice)
 
     if file_format:
+        from src.data_utils import export_vacancies
+
         filename = export_vacancies(vacancies, file_format=file_format)
         print(f"Данные экспортированы в файл: {filename}")
     else:
         print("Неверный выбор формата")
 
 
+def handle_login(writer) -> None:
+    """
+    Открывает браузер для входа в аккаунт HH и сохраняет cookies.
+    Args:
+        writer: Объект для работы с базой данных (передается в save_cookies).
+    """
+
+    from src.selenium_utils import save_cookies
+
+    save_cookies(writer)
+
+
 def get_parallel_driver_count() -> int:
     """
     Запрашивает у пользователя количество параллельных Selenium-драйверов.
@@ -223,11 +326,10 @@ def get_parallel_driver_count() -> int:
         int: Количество потоков (от 1 до MAX_PARALLEL_ALLOWED).
     """
 
-    while True:
-        count = get_input(f"Введите число потоков (1–{MAX_PARALLEL_ALLOWED}): ", int)
-        if count is not None and 1 <= count <= MAX_PARALLEL_ALLOWED:
-            return count
+    prompt = f"Введите число потоков (1–{MAX_PARALLEL_ALLOWED}): "
+    while (count := get_input(prompt, int)) is None or not 1 <= count <= MAX_PARALLEL_ALLOWED:
         print(f"❗ Число должно быть от 1 до {MAX_PARALLEL_ALLOWED}")
+    return count
 
 
 def send_apply_to_vacancy(writer) -> None:
@@ -242,18 +344,17 @@ def send_apply_to_vacancy(writer) -> None:
         print("Нет вакансий для отклика.")
         return
 
+    from src.selenium_utils import apply_to_vacancies_parallel_batched
+
     print_menu("selenium")
-    choice = get_input("Введите номер формата: ", int)
-
-    if choice in (1, 2):
-        shadow = (choice == 1)
-        asyncio.run(apply_to_vacancies_parallel_batched(vacancies, shadow=shadow))
-    elif choice in (3, 4):
-        shadow = (choice == 3)
-        count = get_parallel_driver_count()
-        asyncio.run(apply_to_vacancies_parallel_batched(vacancies, shadow=shadow, max_parallel_drivers=count))
-    else:
+    mode = APPLY_MODES.get(get_input("Введите номер формата: ", int))
+    if mode is None:
         print("❌ Неизвестный выбор.")
+        return
+
+    shadow, ask_count = mode
+    kwargs = {"max_parallel_drivers": get_parallel_driver_count()} if ask_count else {}
+    run_async(apply_to_vacancies_parallel_batched(vacancies, shadow=shadow, **kwargs))
 
 
 def clear_table(writer) -> None:
@@ -273,4 +374,4 @@ def exit_program(_=None) -> None:
     """
 
     print("До свидания!")
-    exit()
+    sys.exit(0)